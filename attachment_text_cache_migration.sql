@@ -0,0 +1,12 @@
+-- Migration: cache extracted attachment text by content hash
+-- Uploads record the sha256 of the file; grading looks extracted text up in
+-- attachment_texts and only parses files whose hash has not been seen yet.
+ALTER TABLE file_attachments ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64);
+ALTER TABLE notebook_attachments ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64);
+
+CREATE TABLE IF NOT EXISTS attachment_texts (
+    content_hash VARCHAR(64) PRIMARY KEY,
+    text TEXT,
+    error TEXT,
+    extracted_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
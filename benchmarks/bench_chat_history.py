@@ -0,0 +1,35 @@
+# Query count and latency of GET /experiments/<eid>/chat as history grows.
+# The read path joins senders into one SELECT, so queries per request should
+# stay flat while the full-history latency grows only with serialization.
+import datetime
+
+from bench_utils import setup, auth_headers, count_queries, timed, db, codex_api as c
+
+client = setup(c.User, c.Experiment, c.ChatChannel, c.ChatMessage)
+db.session.add_all([
+    c.User(id=f'bench-user-{i}', email=f'bench{i}@example.com', name=f'Bench {i}', password_hash='x', role='scientist')
+    for i in range(20)
+])
+db.session.add(c.Experiment(id='bench-exp', title='Bench', owner_id='bench-user-0', visibility='public'))
+db.session.add(c.ChatChannel(id='bench-channel', experiment_id='bench-exp', name='default'))
+db.session.commit()
+headers = auth_headers('bench-user-0')
+start = datetime.datetime(2025, 1, 1)
+
+print(f"{'messages':>9} {'queries(all)':>13} {'queries(page)':>14} {'ms(all)':>9} {'ms(page)':>9}")
+total = 0
+for size in (10, 100, 1000, 5000):
+    db.session.add_all([
+        c.ChatMessage(id=f'bench-msg-{i:06d}', channel_id='bench-channel', sender_id=f'bench-user-{i % 20}',
+                      content=f'message {i}', sent_at=start + datetime.timedelta(seconds=i))
+        for i in range(total, size)
+    ])
+    db.session.commit()
+    total = size
+    with count_queries() as full_q:
+        client.get('/experiments/bench-exp/chat', headers=headers)
+    with count_queries() as page_q:
+        client.get('/experiments/bench-exp/chat?limit=50', headers=headers)
+    full_t, _ = timed(lambda: client.get('/experiments/bench-exp/chat', headers=headers))
+    page_t, _ = timed(lambda: client.get('/experiments/bench-exp/chat?limit=50', headers=headers))
+    print(f"{size:>9} {full_q['n']:>13} {page_q['n']:>14} {full_t * 1000:>9.1f} {page_t * 1000:>9.1f}")
@@ -0,0 +1,39 @@
+# Copilot prompt size and build time as the notebook grows: the old prompt
+# (every step and entry to_dict(), diffs included) vs the token-budgeted
+# BM25 context. "warm" is the steady state, with the project index cached.
+import datetime
+import time
+
+from bench_utils import setup, timed, db, codex_api as c
+from context_builder import estimate_tokens
+
+setup(c.User, c.Project, c.Experiment, c.ProtocolVersion, c.ExperimentStep, c.NotebookEntry, c.NotebookAttachment)
+db.session.add(c.User(id='bench-user', email='bench@example.com', name='Bench', password_hash='x', role='scientist'))
+db.session.commit()
+
+print(f"{'entries':>8} {'old tokens':>11} {'new tokens':>11} {'old ms':>8} {'cold ms':>8} {'warm ms':>8}")
+for n in (100, 1000, 5000):
+    pid = f'bench-project-{n}'
+    db.session.add(c.Experiment(id=f'bench-exp-{n}', title=pid, owner_id='bench-user', visibility='public'))
+    db.session.add(c.Project(id=pid, title=pid, owner_id='bench-user', experiment_id=f'bench-exp-{n}'))
+    db.session.add(c.ProtocolVersion(id=f'bench-version-{n}', experiment_id=f'bench-exp-{n}', version_label='v1'))
+    db.session.bulk_save_objects([c.ExperimentStep(id=f'{pid}-step-{i}', protocol_version_id=f'bench-version-{n}', title=f'Step {i}',
+                                                   content_markdown='Incubate the samples at 37C for 30 minutes. ' * 5,
+                                                   order_index=i) for i in range(40)])
+    db.session.bulk_save_objects([c.NotebookEntry(id=f'{pid}-entry-{i}', project_id=pid, user_id='bench-user', user_name='Bench',
+                                                  content=f'Day {i}: ran gel {i % 17}, bands looked {"faint" if i % 5 else "sharp"}. ' * 6,
+                                                  timestamp=datetime.datetime(2026, 1, 1) + datetime.timedelta(minutes=i),
+                                                  diffs=[{'timestamp': '2026-01-01', 'diff': '-old\n+new\n' * 40}])
+                                for i in range(n)])
+    db.session.commit()
+
+    def old_prompt():
+        steps = [s.to_dict() for s in c.ExperimentStep.query.filter_by(protocol_version_id=f'bench-version-{n}')]
+        notebook = [e.to_dict() for e in c.NotebookEntry.query.filter_by(project_id=pid)]
+        return f"Steps:\n{steps}\n\nNotebook Entries:\n{notebook}\n"
+
+    old_t, old = timed(old_prompt, repeat=3)
+    c.copilot_index_cache.clear()
+    cold_t, (new, _) = timed(lambda: c.copilot_prompt('why were the bands faint on gel 3?', pid), repeat=1)
+    warm_t, _ = timed(lambda: c.copilot_prompt('why were the bands faint on gel 3?', pid), repeat=5)
+    print(f"{n:>8} {estimate_tokens(old):>11} {estimate_tokens(new):>11} {old_t * 1000:>8.1f} {cold_t * 1000:>8.1f} {warm_t * 1000:>8.1f}")
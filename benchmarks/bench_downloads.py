@@ -0,0 +1,97 @@
+# Concurrent downloads of one large attachment (BENCH_DOWNLOAD_MB, default
+# 256 MB) from a real threaded server: how long each request occupies a
+# worker when the app streams the bytes vs. when it hands them to the proxy
+# (ATTACHMENT_OFFLOAD=nginx; there is no nginx here, so the offload run
+# measures only the app's share), plus resuming the last 10% with a Range
+# request and a conditional re-download.
+import logging
+import os
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+
+# Requests run on server threads, which an in-memory SQLite database can't
+# serve; use a throwaway file instead.
+os.environ.setdefault('DATABASE_URL', 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'bench.db'))
+
+from werkzeug.serving import make_server
+
+from bench_utils import setup, auth_headers, db, codex_api as c
+
+SIZE = int(os.getenv('BENCH_DOWNLOAD_MB', '256')) * 1024 * 1024
+CLIENTS = (1, 4, 16)
+
+client = setup(c.User, c.Experiment, c.ProtocolVersion, c.ExperimentStep, c.FileAttachment, c.Blob)
+db.session.add(c.User(id='bench-user', email='bench@example.com', name='Bench', password_hash='x', role='scientist'))
+db.session.add(c.Experiment(id='bench-exp', title='Bench', owner_id='bench-user'))
+db.session.add(c.ProtocolVersion(id='bench-version', experiment_id='bench-exp', version_label='v1'))
+db.session.add(c.ExperimentStep(id='bench-step', protocol_version_id='bench-version', title='Bench', order_index=0))
+db.session.commit()
+
+staged = c.staging_file('bench-download')
+with open(os.path.join(c.UPLOAD_FOLDER, staged), 'wb') as f:
+    block = os.urandom(1024 * 1024)
+    for _ in range(SIZE // len(block)):
+        f.write(block)
+digest = c.file_sha256(os.path.join(c.UPLOAD_FOLDER, staged))
+storage_path = c.store_blob(staged, digest, SIZE)
+c.new_attachment('step', 'bench-step', 'bench-attachment', 'bench-user', 'big.bin', 'application/octet-stream',
+                 SIZE, digest, storage_path)
+db.session.commit()
+
+logging.getLogger('werkzeug').setLevel(logging.WARNING)
+server = make_server('127.0.0.1', 0, c.app, threaded=True)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+url = f'http://127.0.0.1:{server.server_port}/attachments/bench-attachment/download'
+
+
+def fetch(headers=None):
+    start = time.perf_counter()
+    with urllib.request.urlopen(urllib.request.Request(url, headers=headers or {})) as res:
+        size = 0
+        while chunk := res.read(1024 * 1024):
+            size += len(chunk)
+        return time.perf_counter() - start, size, res.status
+
+
+def concurrent(n):
+    results = [None] * n
+    def run(i):
+        results[i] = fetch()
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(n)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - start, results
+
+
+try:
+    print(f'{SIZE // (1024 * 1024)} MB attachment')
+    for mode in ('', 'nginx'):
+        c.app.config['ATTACHMENT_OFFLOAD'] = mode
+        for n in CLIENTS:
+            wall, results = concurrent(n)
+            held = sum(r[0] for r in results) / n
+            moved = sum(r[1] for r in results)
+            print(f"{mode or 'app streams':<12} {n:>3} clients: {wall:6.2f} s wall, worker held {held * 1000:8.1f} ms "
+                  f"per request, {moved / wall / 1024 ** 2:8.0f} MB/s through the app")
+    c.app.config['ATTACHMENT_OFFLOAD'] = ''
+    t, size, status = fetch({'Range': f'bytes={SIZE - SIZE // 10}-'})
+    print(f'resume last 10%: {status} {size // (1024 * 1024)} MB in {t * 1000:.1f} ms')
+    t, size, _ = fetch({'Range': 'bytes=0-1048575', 'If-Range': f'"{digest}"'})
+    print(f'first MB with If-Range: {size // 1024} KB in {t * 1000:.1f} ms')
+    try:
+        fetch({'If-None-Match': f'"{digest}"'})
+    except urllib.error.HTTPError as e:
+        print(f'conditional re-download: {e.code}')
+finally:
+    server.shutdown()
+    a = db.session.get(c.FileAttachment, 'bench-attachment')
+    released = c.release_storage(a.storage_path, a.content_hash)
+    db.session.delete(a)
+    db.session.commit()
+    c.collect_storage(released)
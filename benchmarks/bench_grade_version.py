@@ -0,0 +1,50 @@
+# Grading every step of a protocol: one POST /steps/<id>/grade per step
+# (each waited on, as the step page does) vs one POST /versions/<vid>/grade.
+# Fake backend with a delay standing in for o3-mini; cache off so both sides
+# pay for every completion.
+import os
+import tempfile
+import time
+
+os.environ.setdefault('DATABASE_URL', 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'bench.db'))
+os.environ.setdefault('LLM_BACKEND', 'fake')
+os.environ.setdefault('FAKE_LLM_DELAY', '0.2')
+os.environ.setdefault('LLM_CACHE', 'off')
+os.environ.setdefault('LLM_RATE_LIMIT', '0')
+
+from bench_utils import setup, auth_headers, count_queries, db, codex_api as c
+
+STEPS = 40
+client = setup(c.User, c.Experiment, c.ProtocolVersion, c.ExperimentStep, c.FileAttachment, c.AttachmentText, c.LLMJob)
+db.session.add(c.User(id='bench-user', email='bench@example.com', name='Bench', password_hash='x', role='scientist'))
+db.session.add(c.Experiment(id='bench-exp', title='Bench', owner_id='bench-user', visibility='public', description='d' * 1000))
+db.session.add(c.ProtocolVersion(id='bench-version', experiment_id='bench-exp', version_label='v1'))
+for i in range(STEPS):
+    db.session.add(c.ExperimentStep(id=f'bench-step-{i}', protocol_version_id='bench-version', title=f'Step {i}',
+                                    content_markdown='x' * 300, order_index=i))
+db.session.commit()
+headers = auth_headers('bench-user')
+
+
+def wait(job):
+    while job['status'] in ('queued', 'running'):
+        time.sleep(0.05)
+        job = client.get(f"/jobs/{job['id']}", headers=headers).json
+    return job
+
+
+with count_queries() as per_step_queries:
+    start = time.perf_counter()
+    for i in range(STEPS):
+        wait(client.post(f'/steps/bench-step-{i}/grade', headers=headers).json)
+    per_step = time.perf_counter() - start
+
+with count_queries() as bulk_queries:
+    start = time.perf_counter()
+    job = wait(client.post('/versions/bench-version/grade', headers=headers).json)
+    bulk = time.perf_counter() - start
+
+print(f"{STEPS} steps, {c.app.config['FAKE_LLM_DELAY'] * 1000:.0f} ms per completion, "
+      f"batch concurrency {c.app.config['LLM_BATCH_CONCURRENCY']}")
+print(f"per step: {per_step:6.2f} s  {per_step_queries['n']:4d} queries")
+print(f"bulk:     {bulk:6.2f} s  {bulk_queries['n']:4d} queries  graded={job['result']['graded']} failed={len(job['result']['failed'])}")
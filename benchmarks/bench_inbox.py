@@ -0,0 +1,57 @@
+# GET /global-chats for a user with 10^5 messages spread over 500 counterparts.
+# Compares the old approach (load every message, keep the newest per
+# counterpart in Python) with the conversations-table read path.
+import datetime
+import uuid
+
+from bench_utils import setup, auth_headers, count_queries, timed, db, codex_api as c
+
+MESSAGES = 100_000
+COUNTERPARTS = 500
+
+client = setup(c.User, c.GlobalChatMessage, c.Conversation)
+me = 'bench-me'
+others = [f'bench-other-{i}' for i in range(COUNTERPARTS)]
+db.session.add_all([c.User(id=u, email=f'{u}@example.com', name=u, password_hash='x', role='scientist') for u in [me] + others])
+db.session.commit()
+
+start = datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc)
+rows, latest = [], {}
+for i in range(MESSAGES):
+    other = others[i % COUNTERPARTS]
+    sender, recipient = (me, other) if i % 2 else (other, me)
+    row = {'id': str(uuid.uuid4()), 'sender_id': sender, 'recipient_id': recipient,
+           'content': f'message {i}', 'sent_at': start + datetime.timedelta(seconds=i)}
+    rows.append(row)
+    latest[other] = row
+db.session.execute(c.GlobalChatMessage.__table__.insert(), rows)
+db.session.execute(c.Conversation.__table__.insert(), [
+    {'user_id': me, 'other_user_id': other, 'last_message_id': row['id'], 'last_message_at': row['sent_at'], 'unread_count': 0}
+    for other, row in latest.items()
+])
+db.session.commit()
+
+
+def legacy_inbox():
+    msgs = c.GlobalChatMessage.query.filter(
+        (c.GlobalChatMessage.sender_id == me) | (c.GlobalChatMessage.recipient_id == me)
+    ).order_by(c.GlobalChatMessage.sent_at.desc()).all()
+    chat_map = {}
+    for m in msgs:
+        other_id = m.recipient_id if m.sender_id == me else m.sender_id
+        chat_map.setdefault(other_id, m)
+    db.session.expunge_all()
+    return chat_map
+
+
+headers = auth_headers(me)
+legacy_t, legacy = timed(legacy_inbox, repeat=3)
+full_t, _ = timed(lambda: client.get('/global-chats', headers=headers), repeat=3)
+page_t, _ = timed(lambda: client.get('/global-chats?limit=20', headers=headers), repeat=3)
+with count_queries() as q:
+    page = client.get('/global-chats?limit=20', headers=headers).json
+
+print(f'{MESSAGES} messages, {COUNTERPARTS} counterparts')
+print(f'legacy full scan:          {legacy_t * 1000:8.1f} ms ({len(legacy)} conversations)')
+print(f'conversations, all rows:   {full_t * 1000:8.1f} ms')
+print(f'conversations, limit=20:   {page_t * 1000:8.1f} ms ({q["n"]} queries, {len(page["items"])} rows)')
@@ -0,0 +1,46 @@
+# Re-grading an unchanged project: first run pays for the completion, the
+# rest are served from the prompt cache. Uses the fake backend with a delay
+# standing in for o3-mini.
+import os
+import tempfile
+import time
+
+os.environ.setdefault('DATABASE_URL', 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'bench.db'))
+os.environ.setdefault('LLM_BACKEND', 'fake')
+os.environ.setdefault('FAKE_LLM_DELAY', '1.0')
+os.environ.setdefault('LLM_CACHE_DIR', tempfile.mkdtemp())
+
+from bench_utils import setup, auth_headers, db, codex_api as c
+
+client = setup(c.User, c.Project, c.Experiment, c.ProtocolVersion, c.ExperimentStep, c.FileAttachment,
+               c.AttachmentText, c.LLMJob, c.LLMCacheEntry)
+db.session.add(c.User(id='bench-user', email='bench@example.com', name='Bench', password_hash='x', role='scientist'))
+db.session.add(c.Experiment(id='bench-exp', title='Bench', owner_id='bench-user', visibility='public', description='d' * 2000))
+db.session.add(c.Project(id='bench-project', title='Bench', owner_id='bench-user', experiment_id='bench-exp'))
+db.session.add(c.ProtocolVersion(id='bench-version', experiment_id='bench-exp', version_label='v1'))
+for i in range(50):
+    db.session.add(c.ExperimentStep(id=f'bench-step-{i}', protocol_version_id='bench-version', title=f'Step {i}',
+                                    content_markdown='x' * 500, order_index=i))
+db.session.commit()
+headers = auth_headers('bench-user')
+
+
+def grade(query=''):
+    start = time.perf_counter()
+    job = client.post(f'/projects/bench-project/grade{query}', headers=headers).json
+    while job['status'] in ('queued', 'running'):
+        time.sleep(0.005)
+        job = client.get(f"/jobs/{job['id']}", headers=headers).json
+    return time.perf_counter() - start
+
+
+print(f"{'store':>8} {'miss ms':>9} {'hit ms':>8} {'force ms':>9}")
+for name, store in (('memory', c.make_store('memory', 1000, 3600)),
+                    ('disk', c.make_store('disk', 1000, 3600, os.environ['LLM_CACHE_DIR'])),
+                    ('db', c.DBPromptStore(1000, 3600))):
+    c.llm.store = store
+    miss = grade()
+    hit = min(grade() for _ in range(5))
+    forced = grade('?force=true')
+    print(f"{name:>8} {miss * 1000:>9.1f} {hit * 1000:>8.1f} {forced * 1000:>9.1f}")
+print(c.llm.stats())
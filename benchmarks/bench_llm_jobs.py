@@ -0,0 +1,43 @@
+# How long an LLM route holds a request worker now that grading runs as a
+# background job, using the fake backend to stand in for a slow completion.
+# Before, a request worker was busy for the whole completion (FAKE_LLM_DELAY).
+import os
+import tempfile
+import time
+
+# Jobs commit from worker threads, which an in-memory SQLite database (one
+# shared connection) can't take; use a throwaway file instead.
+os.environ.setdefault('DATABASE_URL', 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'bench.db'))
+os.environ.setdefault('LLM_BACKEND', 'fake')
+os.environ.setdefault('FAKE_LLM_DELAY', '1.0')
+os.environ.setdefault('LLM_JOBS_PER_USER', '2')
+
+from bench_utils import setup, auth_headers, timed, db, codex_api as c
+
+USERS = 8
+client = setup(c.User, c.Experiment, c.ProtocolVersion, c.ExperimentStep, c.FileAttachment, c.AttachmentText, c.LLMJob)
+for u in range(USERS):
+    db.session.add(c.User(id=f'bench-user-{u}', email=f'bench{u}@example.com', name='Bench', password_hash='x', role='scientist'))
+db.session.add(c.Experiment(id='bench-exp', title='Bench', owner_id='bench-user-0', visibility='public'))
+db.session.add(c.ProtocolVersion(id='bench-version', experiment_id='bench-exp', version_label='v1'))
+db.session.add(c.ExperimentStep(id='bench-step', protocol_version_id='bench-version', title='Step', order_index=0))
+db.session.commit()
+
+delay = c.app.config['FAKE_LLM_DELAY']
+start = time.perf_counter()
+statuses = []
+held = []
+for u in range(USERS):
+    for _ in range(3):
+        t = time.perf_counter()
+        statuses.append(client.post('/steps/bench-step/grade', headers=auth_headers(f'bench-user-{u}')).status_code)
+        held.append(time.perf_counter() - t)
+submitted = time.perf_counter() - start
+c.llm_executor.shutdown(wait=True)
+drained = time.perf_counter() - start
+
+print(f"fake completion: {delay * 1000:.0f} ms, workers: {c.app.config['LLM_WORKERS']}, per-user limit: {c.app.config['LLM_JOBS_PER_USER']}")
+print(f"requests: {len(statuses)}  accepted (202): {statuses.count(202)}  throttled (429): {statuses.count(429)}")
+print(f"request worker held per call: max {max(held) * 1000:.1f} ms (was >= {delay * 1000:.0f} ms synchronous)")
+print(f"all {len(statuses)} requests answered in {submitted * 1000:.0f} ms; queue drained in {drained:.1f} s")
+print('jobs:', {s: n for s, n in db.session.query(c.LLMJob.status, db.func.count()).group_by(c.LLMJob.status)})
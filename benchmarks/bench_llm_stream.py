@@ -0,0 +1,40 @@
+# Time to first text for copilot chat: polling the background job vs
+# ?stream=true. Fake backend with a delay standing in for a long generation.
+import json
+import os
+import tempfile
+import time
+
+os.environ.setdefault('DATABASE_URL', 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'bench.db'))
+os.environ.setdefault('LLM_BACKEND', 'fake')
+os.environ.setdefault('FAKE_LLM_DELAY', '5.0')
+
+from bench_utils import setup, auth_headers, db, codex_api as c
+
+client = setup(c.User, c.LLMJob)
+db.session.add(c.User(id='bench-user', email='bench@example.com', name='Bench', password_hash='x', role='scientist'))
+db.session.commit()
+headers = auth_headers('bench-user')
+body = {'message': 'Which step is the riskiest?'}
+
+start = time.perf_counter()
+job = client.post('/copilot-chat', json=body, headers=headers).json
+while job['status'] in ('queued', 'running'):
+    time.sleep(0.05)
+    job = client.get(f"/jobs/{job['id']}", headers=headers).json
+polled = time.perf_counter() - start
+
+start = time.perf_counter()
+resp = client.post('/copilot-chat?stream=true', json=body, headers=headers, buffered=False)
+first_byte = first_token = None
+for chunk in resp.response:
+    now = time.perf_counter() - start
+    first_byte = first_byte if first_byte is not None else now
+    if first_token is None and json.loads(chunk.decode()[6:])['type'] == 'token':
+        first_token = now
+streamed = time.perf_counter() - start
+resp.close()
+
+print(f"fake generation: {c.app.config['FAKE_LLM_DELAY']:.1f} s")
+print(f"job + polling: first text after {polled * 1000:7.0f} ms")
+print(f"stream:        first byte {first_byte * 1000:7.0f} ms, first token {first_token * 1000:7.0f} ms, complete {streamed * 1000:7.0f} ms")
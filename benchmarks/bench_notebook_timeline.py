@@ -0,0 +1,62 @@
+# GET /projects/<id>/notebook for a 2,000-entry notebook where every entry has
+# an attachment. Compares the old lazy-loading listing (one attachments query
+# per entry) with the selectinload listing and with single pages, including a
+# page deep in the timeline.
+import datetime
+import uuid
+
+from bench_utils import setup, auth_headers, count_queries, timed, db, codex_api as c
+
+ENTRIES = 2000
+
+client = setup(c.User, c.Project, c.NotebookEntry, c.NotebookAttachment)
+db.session.add(c.User(id='bench-user', email='bench@example.com', name='Bench', password_hash='x', role='scientist'))
+db.session.add(c.Project(id='bench-project', owner_id='bench-user', title='Bench'))
+db.session.commit()
+
+start = datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc)
+entries = [{'id': str(uuid.uuid4()), 'project_id': 'bench-project', 'user_id': 'bench-user', 'revision': 0,
+            'session_id': f'session-{i // 50}', 'visibility': 'team', 'content': f'entry {i}',
+            'timestamp': start + datetime.timedelta(minutes=i)} for i in range(ENTRIES)]
+db.session.execute(c.NotebookEntry.__table__.insert(), entries)
+db.session.execute(c.NotebookAttachment.__table__.insert(), [
+    {'id': str(uuid.uuid4()), 'entry_id': e['id'], 'filename': 'data.csv', 'storage_path': 'data.csv'} for e in entries
+])
+db.session.commit()
+headers = auth_headers('bench-user')
+url = '/projects/bench-project/notebook'
+
+
+def legacy_listing():
+    rows = c.NotebookEntry.query.filter_by(project_id='bench-project').order_by(c.NotebookEntry.timestamp.desc()).all()
+    result = [e.to_dict() for e in rows]
+    db.session.expunge_all()
+    return result
+
+
+def deep_page():
+    cursor = None
+    for _ in range(20):
+        page = client.get(url + '?limit=50' + (f'&cursor={cursor}' if cursor else ''), headers=headers).json
+        cursor = page['next_cursor']
+    return page
+
+
+with count_queries() as legacy_q:
+    legacy_listing()
+with count_queries() as full_q:
+    client.get(url, headers=headers)
+with count_queries() as page_q:
+    client.get(url + '?limit=50', headers=headers)
+legacy_t, _ = timed(legacy_listing, repeat=3)
+full_t, _ = timed(lambda: client.get(url, headers=headers), repeat=3)
+page_t, _ = timed(lambda: client.get(url + '?limit=50', headers=headers), repeat=5)
+deep_t, _ = timed(deep_page, repeat=1)
+filtered_t, filtered = timed(lambda: client.get(url + '?limit=50&session_id=session-7', headers=headers).json, repeat=5)
+
+print(f'{ENTRIES} entries, one attachment each')
+print(f'legacy lazy listing:   {legacy_t * 1000:8.1f} ms ({legacy_q["n"]} queries)')
+print(f'selectinload listing:  {full_t * 1000:8.1f} ms ({full_q["n"]} queries)')
+print(f'first page, limit=50:  {page_t * 1000:8.1f} ms ({page_q["n"]} queries)')
+print(f'20th page, limit=50:   {deep_t * 1000 / 20:8.1f} ms per page')
+print(f'session filter page:   {filtered_t * 1000:8.1f} ms ({len(filtered["items"])} rows)')
@@ -0,0 +1,71 @@
+# GET /search latency over a synthetic corpus of notebook entries, chat
+# messages and protocol steps (BENCH_SEARCH_DOCS in total, default 200,000).
+# Meaningful numbers need Postgres, where the generated tsvector columns and
+# GIN indexes from search_migration.sql are applied to the scratch database
+# first; on SQLite this exercises the substring fallback.
+import datetime
+import os
+import random
+import re
+import uuid
+
+from bench_utils import setup, auth_headers, count_queries, timed, db, codex_api as c
+
+DOCS = int(os.getenv('BENCH_SEARCH_DOCS', '200000'))
+WORDS = ('buffer lysate kinase western blot antibody incubate centrifuge pellet supernatant plasmid '
+         'transfection culture passage assay fluorescence microscope gel band primer sequence').split()
+
+postgres = os.environ['DATABASE_URL'].startswith('postgresql')
+models = [c.User, c.Project, c.Experiment, c.ProtocolVersion, c.ExperimentStep, c.ChatChannel, c.ChatMessage,
+          c.NotebookEntry, c.NotebookAttachment]
+client = setup(*models + ([c.DiscoveryItem] if postgres else []))
+if postgres:
+    with open(os.path.join(os.path.dirname(__file__), '..', 'search_migration.sql')) as f:
+        sql = re.sub(r'--.*', '', f.read()).replace('CONCURRENTLY ', '')
+    for statement in filter(str.strip, sql.split(';')):
+        db.session.execute(db.text(statement))
+db.session.add_all([
+    c.User(id=u, email=f'{u}@example.com', name=u, password_hash='x', role='scientist') for u in ('bench-user', 'bench-other')
+])
+db.session.add(c.Experiment(id='bench-exp', title='Bench', owner_id='bench-user', visibility='private'))
+db.session.add(c.Project(id='bench-project', title='Bench', owner_id='bench-user', experiment_id='bench-exp'))
+db.session.add(c.ProtocolVersion(id='bench-version', experiment_id='bench-exp', version_label='v1'))
+db.session.add(c.ChatChannel(id='bench-channel', experiment_id='bench-exp', name='general'))
+db.session.commit()
+
+rng = random.Random(0)
+start = datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc)
+text = lambda i: ' '.join(rng.choice(WORDS) for _ in range(40)) + (' zymogen' if i % 10000 == 0 else '')
+third = DOCS // 3
+for offset in range(0, third, 10000):
+    n = min(10000, third - offset)
+    db.session.execute(c.NotebookEntry.__table__.insert(), [
+        {'id': str(uuid.uuid4()), 'project_id': 'bench-project', 'user_id': 'bench-user', 'revision': 0, 'visibility': 'team',
+         'content': text(offset + i), 'timestamp': start + datetime.timedelta(seconds=offset + i)} for i in range(n)])
+    db.session.execute(c.ChatMessage.__table__.insert(), [
+        {'id': str(uuid.uuid4()), 'channel_id': 'bench-channel', 'sender_id': 'bench-user',
+         'content': text(offset + i), 'sent_at': start + datetime.timedelta(seconds=offset + i)} for i in range(n)])
+    db.session.execute(c.ExperimentStep.__table__.insert(), [
+        {'id': str(uuid.uuid4()), 'protocol_version_id': 'bench-version', 'title': f'Step {offset + i}',
+         'content_markdown': text(offset + i), 'order_index': offset + i} for i in range(n)])
+    db.session.commit()
+if postgres:
+    db.session.execute(db.text('ANALYZE'))
+    db.session.commit()
+
+types = 'notebook,step,chat,paper' + (',discovery' if postgres else '')
+cases = {
+    'rare term': 'zymogen',
+    'common term': 'kinase',
+    'two terms': 'kinase antibody',
+    'phrase': '"western blot"',
+    'no access': 'zymogen',
+}
+print(f'{third * 3} documents on {db.engine.dialect.name}')
+for name, q in cases.items():
+    headers = auth_headers('bench-other' if name == 'no access' else 'bench-user')
+    url = f'/search?types={types}&q={q}'
+    with count_queries() as queries:
+        page = client.get(url, headers=headers).json
+    t, _ = timed(lambda: client.get(url, headers=headers), repeat=5)
+    print(f'{name:<12} {t * 1000:8.1f} ms ({queries["n"]} queries, {len(page["items"])} hits on the page)')
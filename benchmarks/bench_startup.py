@@ -0,0 +1,69 @@
+# Worker cold start: each run is a fresh interpreter that imports codex_api,
+# builds the app and serves one request (GET /login) through the test
+# client, which is what an autoscaled or serverless worker pays before it can
+# answer anything. Reports the median of RUNS runs, then the slowest imports
+# under codex_api from `python -X importtime`.
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+RUNS = int(os.getenv('BENCH_STARTUP_RUNS', '7'))
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+ENV = dict(os.environ, DATABASE_URL=os.getenv('DATABASE_URL', 'sqlite://'))
+
+CHILD = """
+import json, time
+start = time.perf_counter()
+import codex_api
+imported = time.perf_counter()
+app = codex_api.create_app() if hasattr(codex_api, 'create_app') else codex_api.app
+created = time.perf_counter()
+status = app.test_client().get('/login').status_code
+served = time.perf_counter()
+print(json.dumps({'import': imported - start, 'create_app': created - imported, 'first_request': served - created,
+                  'status': status}))
+"""
+
+
+def run_child():
+    start = time.perf_counter()
+    out = subprocess.run([sys.executable, '-c', CHILD], cwd=ROOT, env=ENV, capture_output=True, text=True, check=True)
+    result = json.loads(out.stdout.strip().splitlines()[-1])
+    result['process'] = time.perf_counter() - start
+    return result
+
+
+def importtime(top=12):
+    out = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import codex_api'], cwd=ROOT, env=ENV,
+                         capture_output=True, text=True, check=True)
+    subtree = []
+    for line in out.stderr.splitlines():
+        fields = line.removeprefix('import time:').split('|')
+        if len(fields) != 3 or not fields[1].strip().isdigit():
+            continue
+        name = fields[2][1:]
+        level = (len(name) - len(name.lstrip())) // 2
+        if level == 0:
+            # A module is printed after everything it imported.
+            if name.strip() == 'codex_api':
+                total = int(fields[1])
+                break
+            subtree = []
+        else:
+            subtree.append((int(fields[1]), level, name.strip()))
+    direct = [(us, name) for us, level, name in subtree if level == 1]
+    return total, sorted(direct, reverse=True)[:top]
+
+
+runs = [run_child() for _ in range(RUNS)]
+assert all(r['status'] == 200 for r in runs), runs
+print(f'median of {RUNS} cold starts:')
+for key in ('import', 'create_app', 'first_request', 'process'):
+    print(f'  {key:<14} {statistics.median(r[key] for r in runs) * 1000:7.1f} ms')
+total, slowest = importtime()
+print(f'python -X importtime: codex_api {total / 1000:.1f} ms cumulative; slowest direct imports:')
+for us, name in slowest:
+    print(f'  {us / 1000:7.1f} ms {name}')
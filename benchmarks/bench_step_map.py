@@ -0,0 +1,47 @@
+# Full step_map replace vs a one-node JSON Patch, as sent by the flowchart
+# editor after a drag. Reports request bytes and server write latency.
+# (SQLite by default; point DATABASE_URL at Postgres to include JSONB/WAL cost.)
+import json
+
+from bench_utils import setup, auth_headers, timed, db, codex_api as c
+
+client = setup(c.User, c.Experiment, c.ProtocolVersion)
+db.session.add(c.User(id='bench-user', email='bench@example.com', name='Bench', password_hash='x', role='scientist'))
+db.session.add(c.Experiment(id='bench-exp', title='Bench', owner_id='bench-user', visibility='public'))
+db.session.commit()
+headers = auth_headers('bench-user')
+
+
+def make_map(n):
+    nodes = [{'id': f'00000000-0000-0000-0000-{i:012d}', 'type': 'step', 'name': f'Step {i} with a descriptive name',
+              'x': 40 * (i % 20), 'y': 60 * (i // 20)} for i in range(n)]
+    connections = [{'from': nodes[i]['id'], 'to': nodes[i + 1]['id']} for i in range(n - 1)]
+    return {'nodes': nodes, 'connections': connections}
+
+
+print(f"{'nodes':>6} {'full bytes':>11} {'patch bytes':>12} {'full ms':>9} {'patch ms':>9}")
+for n in (50, 200, 500, 1000):
+    vid = f'bench-version-{n}'
+    db.session.add(c.ProtocolVersion(id=vid, experiment_id='bench-exp', version_label='v1', step_map=make_map(n)))
+    db.session.commit()
+    url = f'/protocol-versions/{vid}/step-map'
+    step_map = make_map(n)
+    counter = {'x': 0, 'version': 0}
+
+    def full_replace():
+        counter['x'] += 1
+        step_map['nodes'][n // 2]['x'] = counter['x']
+        body = json.dumps({'step_map': step_map, 'version': counter['version']})
+        counter['version'] = client.patch(url, data=body, content_type='application/json', headers=headers).json['version']
+        return len(body)
+
+    def patch():
+        counter['x'] += 1
+        body = json.dumps({'patch': [{'op': 'replace', 'path': f'/nodes/{n // 2}/x', 'value': counter['x']}],
+                           'version': counter['version']})
+        counter['version'] = client.patch(url, data=body, content_type='application/json', headers=headers).json['version']
+        return len(body)
+
+    full_t, full_bytes = timed(full_replace, repeat=10)
+    patch_t, patch_bytes = timed(patch, repeat=10)
+    print(f"{n:>6} {full_bytes:>11} {patch_bytes:>12} {full_t * 1000:>9.2f} {patch_t * 1000:>9.2f}")
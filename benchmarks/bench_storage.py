@@ -0,0 +1,101 @@
+# Attachments on an S3-compatible store (BENCH_STORAGE_MB, default 64 MB).
+# Points at S3_ENDPOINT_URL/S3_BUCKET if set (e.g. a local MinIO:
+#   S3_ENDPOINT_URL=http://localhost:9000 S3_BUCKET=codex-bench
+#   AWS_ACCESS_KEY_ID=minioadmin AWS_SECRET_ACCESS_KEY=minioadmin),
+# otherwise starts moto's S3 server in-process (pip install 'moto[server]').
+# Compares a chunked upload through the app, which the app then pushes to the
+# bucket as a multipart upload, with a direct presigned PUT, and how long the
+# app is busy per download when it only has to presign a redirect. Completing
+# a direct upload is a HEAD and a server-side copy on S3 and MinIO; moto keeps
+# no checksums, so there the app reads the object back to hash it.
+import hashlib
+import os
+import sys
+import time
+import urllib.request
+
+os.environ['STORAGE_BACKEND'] = 's3'
+os.environ.setdefault('S3_BUCKET', 'codex-bench')
+moto_server = None
+if not os.getenv('S3_ENDPOINT_URL'):
+    try:
+        from moto.server import ThreadedMotoServer
+    except ImportError:
+        sys.exit('Set S3_ENDPOINT_URL to an S3-compatible store, or install moto[server]')
+    for name in ('AWS_ACCESS_KEY_ID', 'AWS_SECRET_ACCESS_KEY'):
+        os.environ.setdefault(name, 'bench')
+    os.environ.setdefault('S3_REGION', 'us-east-1')
+    moto_server = ThreadedMotoServer(ip_address='127.0.0.1', port=0, verbose=False)
+    moto_server.start()
+    host, port = moto_server.get_host_and_port()
+    os.environ['S3_ENDPOINT_URL'] = f'http://{host}:{port}'
+
+from bench_utils import setup, auth_headers, db, codex_api as c
+
+SIZE = int(os.getenv('BENCH_STORAGE_MB', '64')) * 1024 * 1024
+DOWNLOADS = 200
+
+client = setup(c.User, c.Experiment, c.ProtocolVersion, c.ExperimentStep, c.FileAttachment, c.UploadSession, c.Blob,
+               c.Project, c.NotebookEntry, c.NotebookAttachment)
+s3 = c.storage.client()
+try:
+    s3.create_bucket(Bucket=c.storage.bucket)
+except s3.exceptions.BucketAlreadyOwnedByYou:
+    pass
+db.session.add(c.User(id='bench-user', email='bench@example.com', name='Bench', password_hash='x', role='scientist'))
+db.session.add(c.Experiment(id='bench-exp', title='Bench', owner_id='bench-user'))
+db.session.add(c.ProtocolVersion(id='bench-version', experiment_id='bench-exp', version_label='v1'))
+db.session.add(c.ExperimentStep(id='bench-step', protocol_version_id='bench-version', title='Bench', order_index=0))
+db.session.commit()
+headers = auth_headers('bench-user')
+created = []
+
+
+def through_app(data):
+    upload = client.post('/steps/bench-step/uploads', headers=headers, json={'filename': 'big.bin', 'size': len(data)}).json
+    part_size = upload['part_size']
+    for n in range(upload['part_count']):
+        client.put(f"/uploads/{upload['id']}/parts/{n}", headers=headers, data=data[n * part_size:(n + 1) * part_size])
+    start = time.perf_counter()
+    res = client.post(f"/uploads/{upload['id']}/complete", headers=headers)
+    assert res.status_code == 201, res.json
+    created.append(res.json['id'])
+    return time.perf_counter() - start
+
+
+def direct(data):
+    upload = client.post('/steps/bench-step/files/upload-url', headers=headers,
+                         json={'filename': 'big.bin', 'size': len(data), 'sha256': hashlib.sha256(data).hexdigest(),
+                               'mime_type': 'application/octet-stream'}).json
+    urllib.request.urlopen(urllib.request.Request(upload['upload_url'], data=data, method='PUT', headers=upload['headers']))
+    start = time.perf_counter()
+    res = client.post(f"/uploads/{upload['id']}/complete", headers=headers)
+    assert res.status_code == 201, res.json
+    created.append(res.json['id'])
+    return time.perf_counter() - start
+
+
+try:
+    print(f"{SIZE // (1024 * 1024)} MB file, {os.environ['S3_ENDPOINT_URL']}")
+    start = time.perf_counter()
+    complete = through_app(os.urandom(SIZE))
+    print(f'through the app: {time.perf_counter() - start:6.2f} s ({complete:.2f} s of it pushing to the bucket on complete)')
+    start = time.perf_counter()
+    complete = direct(os.urandom(SIZE))
+    print(f'direct PUT:      {time.perf_counter() - start:6.2f} s ({complete:.2f} s of it completing; the upload never '
+          f'passes through the app)')
+    url = f'/attachments/{created[0]}/download'
+    start = time.perf_counter()
+    for _ in range(DOWNLOADS):
+        assert client.get(url).status_code == 302
+    print(f'download redirect: {(time.perf_counter() - start) / DOWNLOADS * 1000:.2f} ms of app time per request')
+finally:
+    released = set()
+    for a in c.FileAttachment.query.filter(c.FileAttachment.id.in_(created)):
+        released.add(c.release_storage(a.storage_path, a.content_hash))
+        db.session.delete(a)
+    db.session.commit()
+    for key in released:
+        c.collect_storage(key)
+    if moto_server is not None:
+        moto_server.stop()
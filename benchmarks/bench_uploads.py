@@ -0,0 +1,84 @@
+# Uploading one large attachment (BENCH_UPLOAD_MB, default 256 MB): the
+# multipart POST /steps/<id>/attachments vs the chunked session API, plus a
+# connection that drops halfway through and resumes. Reports wall time and
+# how many bytes had to be sent again after the drop. Then attaches the same
+# file to 30 more steps by hash, as the upload UI does for content the user
+# has already stored.
+import hashlib
+import io
+import os
+import time
+
+from bench_utils import setup, auth_headers, db, codex_api as c
+
+SIZE = int(os.getenv('BENCH_UPLOAD_MB', '256')) * 1024 * 1024
+
+client = setup(c.User, c.Experiment, c.ProtocolVersion, c.ExperimentStep, c.FileAttachment, c.UploadSession, c.Blob,
+               c.Project, c.NotebookEntry, c.NotebookAttachment)
+db.session.add(c.User(id='bench-user', email='bench@example.com', name='Bench', password_hash='x', role='scientist'))
+db.session.add(c.Experiment(id='bench-exp', title='Bench', owner_id='bench-user'))
+db.session.add(c.ProtocolVersion(id='bench-version', experiment_id='bench-exp', version_label='v1'))
+db.session.add_all([c.ExperimentStep(id=f'bench-step-{i}' if i else 'bench-step', protocol_version_id='bench-version',
+                                     title='Bench', order_index=i) for i in range(31)])
+db.session.commit()
+headers = auth_headers('bench-user')
+data = os.urandom(1024 * 1024) * (SIZE // (1024 * 1024))
+digest = hashlib.sha256(data).hexdigest()
+created = []
+
+
+def multipart():
+    res = client.post('/steps/bench-step/attachments', headers=headers,
+                      data={'file': (io.BytesIO(data), 'big.bin')}, content_type='multipart/form-data')
+    created.append(res.json['id'])
+
+
+def chunked(drop_after=None):
+    upload = client.post('/steps/bench-step/uploads', headers=headers, json={'filename': 'big.bin', 'size': SIZE}).json
+    part_size, sent = upload['part_size'], 0
+    for n in range(upload['part_count']):
+        if drop_after is not None and n == drop_after:
+            break
+        client.put(f"/uploads/{upload['id']}/parts/{n}", headers=headers, data=data[n * part_size:(n + 1) * part_size])
+    if drop_after is not None:
+        # Reconnect: ask which parts arrived and send only the rest.
+        received = set(client.get(f"/uploads/{upload['id']}", headers=headers).json['received'])
+        for n in range(upload['part_count']):
+            if n not in received:
+                client.put(f"/uploads/{upload['id']}/parts/{n}", headers=headers, data=data[n * part_size:(n + 1) * part_size])
+                sent += len(data[n * part_size:(n + 1) * part_size])
+    res = client.post(f"/uploads/{upload['id']}/complete", headers=headers, json={'sha256': digest})
+    assert res.status_code == 201, res.json
+    created.append(res.json['id'])
+    return sent
+
+
+try:
+    print(f'{SIZE // (1024 * 1024)} MB file')
+    start = time.perf_counter()
+    multipart()
+    print(f'multipart POST:           {time.perf_counter() - start:6.2f} s (a drop restarts from byte 0)')
+    start = time.perf_counter()
+    chunked()
+    print(f'chunked, in order:        {time.perf_counter() - start:6.2f} s')
+    parts = -(-SIZE // c.app.config['UPLOAD_PART_SIZE'])
+    start = time.perf_counter()
+    resent = chunked(drop_after=parts // 2)
+    print(f'chunked, drop + resume:   {time.perf_counter() - start:6.2f} s ({resent // (1024 * 1024)} MB sent after the drop)')
+    start = time.perf_counter()
+    for i in range(1, 31):
+        res = client.post(f'/steps/bench-step-{i}/uploads', headers=headers,
+                          json={'filename': 'big.bin', 'size': SIZE, 'sha256': digest})
+        assert res.json.get('deduplicated'), res.json
+        created.append(res.json['id'])
+    stored = sum(b.size_bytes for b in c.Blob.query)
+    print(f'30 re-attachments by hash: {time.perf_counter() - start:5.2f} s '
+          f'({len(created)} attachments, {stored // (1024 * 1024)} MB on disk)')
+finally:
+    released = set()
+    for a in c.FileAttachment.query.filter(c.FileAttachment.id.in_(created)):
+        released.add(c.release_storage(a.storage_path, a.content_hash))
+        db.session.delete(a)
+    db.session.commit()
+    for key in released:
+        c.collect_storage(key)
@@ -0,0 +1,50 @@
+# Shared setup for the scripts in this folder.
+# By default they run against an in-memory SQLite database so they need no
+# Postgres. Set DATABASE_URL to a *scratch* Postgres database to measure the
+# real planner; the scripts insert synthetic rows.
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+
+import codex_api
+from codex_api import app, db
+
+
+def setup(*models):
+    ctx = app.app_context()
+    ctx.push()
+    db.metadata.create_all(db.engine, tables=[m.__table__ for m in models])
+    return app.test_client()
+
+
+def auth_headers(user_id):
+    return {'Authorization': 'Bearer ' + create_access_token(identity=user_id)}
+
+
+@contextmanager
+def count_queries():
+    counter = {'n': 0}
+    def before_execute(*args):
+        counter['n'] += 1
+    event.listen(db.engine, 'before_cursor_execute', before_execute)
+    try:
+        yield counter
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_execute)
+
+
+def timed(fn, repeat=5):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
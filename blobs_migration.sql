@@ -0,0 +1,15 @@
+-- Migration: content-addressed attachment store
+-- Attachment files now live once per distinct content under
+-- uploads/blobs/<aa>/<bb>/<sha256>; this table counts the attachment rows
+-- sharing each file. After applying it, run `python dedupe_uploads.py` once
+-- (try --dry-run first) to move existing uploads into the store.
+CREATE TABLE IF NOT EXISTS blobs (
+    content_hash VARCHAR(64) PRIMARY KEY,
+    size_bytes BIGINT,
+    refcount INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- owns_content(): "does this user already have an attachment with these bytes"
+CREATE INDEX IF NOT EXISTS idx_file_attachments_owner_hash ON file_attachments (owner_id, content_hash);
+CREATE INDEX IF NOT EXISTS idx_notebook_attachments_hash ON notebook_attachments (content_hash);
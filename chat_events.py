@@ -0,0 +1,164 @@
+# In-process pub/sub broker for pushing chat messages to open SSE streams.
+#
+# Routes publish an event after db.session.commit(); every subscriber of that
+# topic in *this* process gets it through its queue. The backend decides how
+# a publish reaches the other workers:
+#   - LocalBackend: single process only (dev server, tests).
+#   - PostgresBackend: pg_notify on publish, one LISTEN thread per worker
+#     that feeds notifications into the local broker.
+import json
+import queue
+import select
+import threading
+from collections import defaultdict
+
+NOTIFY_CHANNEL = 'codex_events'
+# Postgres rejects NOTIFY payloads of 8000 bytes or more; bigger events are
+# sent as a stub and the client refetches with ?since=.
+MAX_NOTIFY_PAYLOAD = 7500
+
+
+class Subscription:
+    def __init__(self, broker, topic, maxsize):
+        self.broker = broker
+        self.topic = topic
+        self.queue = queue.Queue(maxsize=maxsize)
+
+    def get(self, timeout=None):
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class EventBroker:
+    def __init__(self, backend=None):
+        self.backend = backend or LocalBackend()
+        self._lock = threading.Lock()
+        self._subscribers = defaultdict(set)
+        self._started = False
+
+    def subscribe(self, topic, maxsize=256):
+        # The backend is started on first use so importing the app (or running
+        # scripts like truncate_all.py) never opens a LISTEN connection.
+        with self._lock:
+            if not self._started:
+                self.backend.start(self.dispatch)
+                self._started = True
+            sub = Subscription(self, topic, maxsize)
+            self._subscribers[topic].add(sub)
+        return sub
+
+    def unsubscribe(self, sub):
+        with self._lock:
+            subs = self._subscribers.get(sub.topic)
+            if subs:
+                subs.discard(sub)
+                if not subs:
+                    del self._subscribers[sub.topic]
+
+    def publish(self, topic, event):
+        try:
+            self.backend.publish(topic, event)
+        except Exception as e:
+            # Push is best effort; pollers still pick the message up.
+            print(f"[WARN] event publish failed for {topic}: {e}", flush=True)
+
+    def dispatch(self, topic, event):
+        with self._lock:
+            subs = list(self._subscribers.get(topic, ()))
+        for sub in subs:
+            try:
+                sub.queue.put_nowait(event)
+            except queue.Full:
+                # Slow consumer: drop rather than block the publisher. The
+                # client resyncs with ?since= when it reconnects.
+                pass
+
+
+class LocalBackend:
+    def start(self, dispatch):
+        self._dispatch = dispatch
+
+    def publish(self, topic, event):
+        if getattr(self, '_dispatch', None):
+            self._dispatch(topic, event)
+
+
+class PostgresBackend:
+    def __init__(self, dsn, channel=NOTIFY_CHANNEL):
+        # libpq does not understand SQLAlchemy's driver suffix.
+        self.dsn = dsn.replace('postgresql+psycopg2://', 'postgresql://')
+        self.channel = channel
+        self._publish_conn = None
+        self._publish_lock = threading.Lock()
+
+    def _connect(self):
+        import psycopg2
+        conn = psycopg2.connect(self.dsn)
+        conn.autocommit = True
+        return conn
+
+    def start(self, dispatch):
+        thread = threading.Thread(target=self._listen, args=(dispatch,), name='codex-events-listener', daemon=True)
+        thread.start()
+
+    def _listen(self, dispatch):
+        while True:
+            conn = None
+            try:
+                conn = self._connect()
+                with conn.cursor() as cur:
+                    cur.execute(f'LISTEN {self.channel}')
+                while True:
+                    if select.select([conn], [], [], 30) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        note = conn.notifies.pop(0)
+                        msg = json.loads(note.payload)
+                        dispatch(msg['topic'], msg['event'])
+            except Exception as e:
+                print(f"[WARN] event listener reconnecting: {e}", flush=True)
+                if conn is not None:
+                    conn.close()
+                threading.Event().wait(2)
+
+    def publish(self, topic, event):
+        payload = json.dumps({'topic': topic, 'event': event})
+        if len(payload.encode()) > MAX_NOTIFY_PAYLOAD:
+            payload = json.dumps({'topic': topic, 'event': {'id': event.get('id'), 'truncated': True}})
+        with self._publish_lock:
+            if self._publish_conn is None or self._publish_conn.closed:
+                self._publish_conn = self._connect()
+            try:
+                with self._publish_conn.cursor() as cur:
+                    cur.execute('SELECT pg_notify(%s, %s)', (self.channel, payload))
+            except Exception:
+                self._publish_conn.close()
+                self._publish_conn = None
+                raise
+
+
+def make_backend(name, dsn=None):
+    if name == 'postgres':
+        return PostgresBackend(dsn)
+    return LocalBackend()
+
+
+def chat_topic(channel_id):
+    return f'chat:{channel_id}'
+
+
+def dm_topic(user1_id, user2_id):
+    a, b = sorted([str(user1_id), str(user2_id)])
+    return f'dm:{a}:{b}'
@@ -0,0 +1,88 @@
+# Picks the parts of a project that fit in an LLM prompt.
+#
+# Documents (steps, notebook entries) go into a BM25Index once; each question
+# is scored against the index and the best matches are packed greedily until
+# the token budget is spent. codex_api.py keeps one index per project and only
+# rebuilds it when the project changes, so answering a question costs about
+# the same however large the project is.
+import math
+import re
+from collections import Counter, defaultdict
+
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+STOPWORDS = frozenset(
+    'a an and are as at be but by can do does for from has have how i if in is it its me my no not of on or our '
+    'so that the their them then there these this to was we were what when where which who why will with you your'.split()
+)
+
+
+def terms(text):
+    return [t for t in TOKEN_RE.findall((text or '').lower()) if t not in STOPWORDS and len(t) > 1]
+
+
+def estimate_tokens(text):
+    # ~4 characters per token for English prose; close enough for budgeting
+    # without pulling in a tokenizer.
+    return (len(text or '') + 3) // 4
+
+
+class BM25Index:
+    def __init__(self, docs, k1=1.5, b=0.75, max_doc_tokens=None):
+        # docs: iterable of (key, text). Texts longer than max_doc_tokens are
+        # cut so one huge entry can't take the whole budget.
+        self.k1 = k1
+        self.b = b
+        self.keys = []
+        self.texts = {}
+        self.cost = {}
+        self.postings = defaultdict(list)
+        lengths = []
+        for key, text in docs:
+            if max_doc_tokens and estimate_tokens(text) > max_doc_tokens:
+                text = text[:max_doc_tokens * 4] + ' [...]'
+            idx = len(self.keys)
+            self.keys.append(key)
+            self.texts[key] = text
+            self.cost[key] = estimate_tokens(text)
+            counts = Counter(terms(text))
+            for term, tf in counts.items():
+                self.postings[term].append((idx, tf))
+            lengths.append(sum(counts.values()))
+        self.lengths = lengths
+        self.avgdl = (sum(lengths) / len(lengths)) if lengths else 0
+
+    def __len__(self):
+        return len(self.keys)
+
+    def search(self, query):
+        # [(key, score)] best first; only documents sharing a term with the
+        # query are touched.
+        n = len(self.keys)
+        scores = defaultdict(float)
+        for term in set(terms(query)):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            for idx, tf in postings:
+                norm = self.k1 * (1 - self.b + self.b * self.lengths[idx] / (self.avgdl or 1))
+                scores[idx] += idf * tf * (self.k1 + 1) / (tf + norm)
+        ranked = sorted(scores.items(), key=lambda kv: kv[1], reverse=True)
+        return [(self.keys[idx], score) for idx, score in ranked]
+
+    def select(self, query, budget, fallback=None):
+        # Keys that fit in `budget` tokens: query matches first, then
+        # `fallback` order (default: insertion order) for what's left.
+        ranked = [key for key, _ in self.search(query)]
+        seen = set(ranked)
+        candidates = ranked + [key for key in (fallback or self.keys) if key not in seen]
+        chosen, used = [], 0
+        for key in candidates:
+            cost = self.cost[key]
+            if used + cost > budget:
+                continue
+            chosen.append(key)
+            used += cost
+            if used >= budget:
+                break
+        return chosen, used
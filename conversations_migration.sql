@@ -0,0 +1,25 @@
+-- Migration: conversations summary table for the /global-chats inbox
+-- One row per participant of each DM pair, maintained by the send handler.
+CREATE TABLE IF NOT EXISTS conversations (
+    user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    other_user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    last_message_id UUID NOT NULL REFERENCES global_chat_messages(id) ON DELETE CASCADE,
+    last_message_at TIMESTAMPTZ NOT NULL,
+    unread_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, other_user_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_conversations_user_last_message
+    ON conversations (user_id, last_message_at DESC, other_user_id DESC);
+
+-- Backfill from existing messages: latest message per (user, counterpart).
+-- Existing history is treated as read.
+INSERT INTO conversations (user_id, other_user_id, last_message_id, last_message_at, unread_count)
+SELECT DISTINCT ON (user_id, other_user_id) user_id, other_user_id, id, sent_at, 0
+FROM (
+    SELECT sender_id AS user_id, recipient_id AS other_user_id, id, sent_at FROM global_chat_messages
+    UNION ALL
+    SELECT recipient_id AS user_id, sender_id AS other_user_id, id, sent_at FROM global_chat_messages
+) m
+ORDER BY user_id, other_user_id, sent_at DESC, id DESC
+ON CONFLICT (user_id, other_user_id) DO NOTHING;
@@ -0,0 +1,81 @@
+from codex_api import (
+    app, db, FileAttachment, NotebookAttachment, UPLOAD_FOLDER, add_blob_refs, blob_path, file_sha256,
+    is_blob_path, remove_file, staging_file, storage,
+)
+import os
+import shutil
+import sys
+import uuid
+
+# One-time move of attachments uploaded before the blob store into it.
+# Usage: python dedupe_uploads.py [--dry-run]
+# Every attachment row with a flat uploads/<uuid><ext> path is hashed (or its
+# content_hash reused), a copy of its file is stored at blobs/<aa>/<bb>/<sha256>
+# in the storage backend (with STORAGE_BACKEND=s3, uploaded to the bucket)
+# unless that content is already stored, and the row is repointed with the
+# blob's refcount bumped. Legacy files are deleted only after every row
+# pointing at them is committed, so a crash leaves each row with a readable
+# file. Safe to re-run: rows already in the store are skipped, and a row whose
+# legacy file is gone but whose blob is stored is repointed.
+
+BATCH = 200
+
+
+def legacy_rows(model):
+    return model.query.filter(db.not_(model.storage_path.like('blobs/%'))).order_by(model.id)
+
+
+def main(dry_run):
+    seen = {}  # legacy path -> content hash (forks can share a path)
+    stored = set()  # hashes in the store, or that will be after this run
+    leftovers = set()
+    moved = deduped = recovered = missing = saved = 0
+    for model in (FileAttachment, NotebookAttachment):
+        rows = legacy_rows(model).all()
+        for i, a in enumerate(rows, 1):
+            path = os.path.join(UPLOAD_FOLDER, a.storage_path)
+            content_hash = seen.get(a.storage_path)
+            if content_hash is None and not os.path.exists(path):
+                if a.content_hash and storage.exists(blob_path(a.content_hash)):
+                    # An earlier run stored the file and removed it, but
+                    # didn't get to commit this row.
+                    recovered += 1
+                    content_hash = a.content_hash
+                else:
+                    missing += 1
+                    print(f'missing file for {model.__tablename__} {a.id}: {a.storage_path}')
+                    continue
+            elif content_hash is None:
+                content_hash = a.content_hash or file_sha256(path)
+                seen[a.storage_path] = content_hash
+                leftovers.add(path)
+                if content_hash in stored or storage.exists(blob_path(content_hash)):
+                    deduped += 1
+                    saved += os.path.getsize(path)
+                else:
+                    moved += 1
+                    stored.add(content_hash)
+                    if not dry_run:
+                        copy = os.path.join(UPLOAD_FOLDER, staging_file(uuid.uuid4().hex))
+                        shutil.copyfile(path, copy)
+                        storage.put(copy, blob_path(content_hash))
+            if dry_run:
+                continue
+            add_blob_refs(content_hash, getattr(a, 'size_bytes', None))
+            a.content_hash = content_hash
+            a.storage_path = blob_path(content_hash)
+            if i % BATCH == 0:
+                db.session.commit()
+        db.session.commit()
+    if not dry_run:
+        for path in leftovers:
+            remove_file(path)
+    print(f'{moved} files moved into the blob store, {deduped} duplicates '
+          f'{"found" if dry_run else "removed"} ({saved / 1024 ** 2:.1f} MB), '
+          f'{recovered} rows repointed to already stored blobs, {missing} missing')
+    return 0
+
+
+if __name__ == '__main__':
+    with app.app_context():
+        sys.exit(main('--dry-run' in sys.argv))
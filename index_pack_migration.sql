@@ -0,0 +1,52 @@
+-- Migration: indexes for the hot lookup columns used by codex_api.py
+-- Run with psql -f (each statement autocommits; CONCURRENTLY cannot run inside a transaction).
+-- python check_indexes.py lists any hot query that still needs a sequential scan.
+
+-- /versions/<vid>/steps, grading, fork: steps of a version in order
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_experiment_steps_version_order
+    ON experiment_steps (protocol_version_id, order_index);
+
+-- latest protocol version of an experiment
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_protocol_versions_experiment_created
+    ON protocol_versions (experiment_id, created_at DESC);
+
+-- attachments of a step
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_file_attachments_step
+    ON file_attachments (experiment_step_id);
+
+-- channel of an experiment, then its history in (sent_at, id) order
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_chat_channels_experiment
+    ON chat_channels (experiment_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_chat_messages_channel_sent
+    ON chat_messages (channel_id, sent_at, id);
+
+-- DM thread: each direction of the OR is an equality on (sender, recipient)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_global_chat_messages_pair_sent
+    ON global_chat_messages (sender_id, recipient_id, sent_at, id);
+
+-- notebook timeline of a project
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_notebook_entries_project_timestamp
+    ON notebook_entries (project_id, timestamp DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_notebook_attachments_entry
+    ON notebook_attachments (entry_id);
+
+-- grant applications by grant and by project
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_grant_applications_grant
+    ON grant_applications (grant_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_grant_applications_project
+    ON grant_applications (project_id);
+
+-- project -> experiment resolution by (title, owner). owner_id leads so the
+-- same index also serves the owner-only filters (/experiments?user_id=, labs).
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_experiments_owner_title
+    ON experiments (owner_id, title);
+
+-- other per-owner / per-parent filters
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_projects_owner
+    ON projects (owner_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_grants_created_by
+    ON grants (created_by_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_collaboration_suggestions_for_user
+    ON collaboration_suggestions (for_user_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_grant_milestones_award
+    ON grant_milestones (award_id);
@@ -0,0 +1,10 @@
+-- Migration: keyset pagination indexes for list endpoints
+-- GET /projects, /experiments, /users, /grants, /labs-list and /discovery page on
+-- (created_at DESC, id DESC); these indexes let each page be a short index range scan.
+CREATE INDEX IF NOT EXISTS idx_projects_created_at_id ON projects (created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_experiments_created_at_id ON experiments (created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_experiments_owner_created_at_id ON experiments (owner_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_users_created_at_id ON users (created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_grants_created_at_id ON grants (created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_labs_created_at_id ON labs (created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_discovery_items_created_at_id ON discovery_items (created_at DESC, id DESC);
@@ -0,0 +1,53 @@
+// AI endpoints (grading, notebook summary, journal match, copilot) answer
+// 202 with a job; runLLMJob submits the request and polls /jobs/<id> until
+// the job finishes, resolving with its result.
+async function runLLMJob(url, options = {}) {
+  const token = localStorage.getItem('access_token') || '';
+  const headers = Object.assign({ 'Authorization': 'Bearer ' + token }, options.headers || {});
+  const res = await fetch(url, Object.assign({}, options, { headers }));
+  let job = await res.json();
+  if (!res.ok) throw new Error(job.error || job.description || res.status);
+  while (job.status === 'queued' || job.status === 'running') {
+    const wait = Number(res.headers.get('Retry-After') || 2) * 1000;
+    await new Promise(resolve => setTimeout(resolve, wait));
+    const poll = await fetch(`/jobs/${encodeURIComponent(job.id)}`, { headers: { 'Authorization': 'Bearer ' + token } });
+    job = await poll.json();
+    if (!poll.ok) throw new Error(job.error || job.description || poll.status);
+  }
+  if (job.status === 'error') throw new Error(job.error || 'AI request failed');
+  return job.result;
+}
+
+// ?stream=true variant: reads the SSE body of a POST/GET (EventSource can't
+// send a body or headers), calls onToken(text) per chunk and resolves with
+// the final 'done' event.
+async function streamLLM(url, options = {}, onToken = () => {}) {
+  const token = localStorage.getItem('access_token') || '';
+  const headers = Object.assign({ 'Authorization': 'Bearer ' + token }, options.headers || {});
+  const sep = url.includes('?') ? '&' : '?';
+  const res = await fetch(url + sep + 'stream=true', Object.assign({}, options, { headers }));
+  if (!res.ok) {
+    const err = await res.json().catch(() => ({}));
+    throw new Error(err.error || err.description || res.status);
+  }
+  const reader = res.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+  while (true) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+    let end;
+    while ((end = buffer.indexOf('\n\n')) !== -1) {
+      const block = buffer.slice(0, end);
+      buffer = buffer.slice(end + 2);
+      const data = block.split('\n').filter(l => l.startsWith('data: ')).map(l => l.slice(6)).join('\n');
+      if (!data) continue;
+      const event = JSON.parse(data);
+      if (event.type === 'token') onToken(event.text);
+      else if (event.type === 'error') throw new Error(event.error);
+      else if (event.type === 'done') return event;
+    }
+  }
+  throw new Error('Stream ended early');
+}
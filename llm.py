@@ -0,0 +1,318 @@
+# Chat-completion backends for the LLM job workers in codex_api.py.
+#   - OpenAIBackend: the real API.
+#   - FakeLLMBackend: canned replies after an optional delay, so tests and
+#     benchmarks run without the network (LLM_BACKEND=fake).
+#   - CachedLLM: wraps either one with a response cache keyed on model +
+#     normalized prompt. Stores: MemoryStore, DiskStore, or the DB-backed
+#     store in codex_api.py (LLM_CACHE=memory|disk|db|off). Cache misses go
+#     through an optional RateLimiter shared by every thread in the process.
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+
+class OpenAIBackend:
+    def __init__(self, api_key):
+        self.api_key = api_key
+        self._client = None
+        self._lock = threading.Lock()
+
+    def client(self):
+        # One client per process, shared by all worker threads.
+        with self._lock:
+            if self._client is None:
+                import openai
+                self._client = openai.OpenAI(api_key=self.api_key)
+            return self._client
+
+    def complete(self, prompt, model):
+        resp = self.client().chat.completions.create(
+            model=model,
+            messages=[{'role': 'user', 'content': prompt}]
+        )
+        return resp.choices[0].message.content
+
+    def stream(self, prompt, model):
+        resp = self.client().chat.completions.create(
+            model=model,
+            messages=[{'role': 'user', 'content': prompt}],
+            stream=True
+        )
+        for chunk in resp:
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                yield delta
+
+
+class FakeLLMBackend:
+    def __init__(self, delay=0.0, reply=None):
+        # reply: fixed string, or callable(prompt, model) -> str
+        self.delay = delay
+        self.reply = reply
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def complete(self, prompt, model):
+        with self._lock:
+            self.calls += 1
+        if self.delay:
+            time.sleep(self.delay)
+        return self._reply(prompt, model)
+
+    def stream(self, prompt, model):
+        # Same reply, one word at a time, with the delay spread across words.
+        with self._lock:
+            self.calls += 1
+        words = re.findall(r'\S+\s*', self._reply(prompt, model))
+        for word in words:
+            if self.delay:
+                time.sleep(self.delay / len(words))
+            yield word
+
+    def _reply(self, prompt, model):
+        if callable(self.reply):
+            return self.reply(prompt, model)
+        if self.reply is not None:
+            return self.reply
+        if 'JSON array' in prompt:
+            return '[]'
+        if 'JSON object' in prompt:
+            return json.dumps(fake_scores(prompt))
+        return f'[{model} reply to a {len(prompt)} character prompt]'
+
+
+def fake_scores(prompt):
+    # Stable per prompt, so repeated grading of the same input agrees.
+    digest = hashlib.sha256(prompt.encode()).digest()
+    score = lambda b: round(1 + (b % 900) / 100 + 0.01, 2)
+    return {
+        'reproducibility': score(digest[0] * 7 + digest[1]),
+        'impact': score(digest[2] * 7 + digest[3]),
+        'difficulty': score(digest[4] * 7 + digest[5]),
+        'estimated_budget': 100 + int.from_bytes(digest[6:9], 'big') % 100000,
+    }
+
+
+def prompt_key(prompt, model):
+    # Whitespace differences (indentation of the f-string prompts, trailing
+    # newlines in notebook text) shouldn't cause a miss.
+    normalized = re.sub(r'\s+', ' ', prompt).strip()
+    return hashlib.sha256(f'{model}\0{normalized}'.encode()).hexdigest()
+
+
+class MemoryStore:
+    # Per-process LRU with a TTL.
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            stored_at, value = item
+            if time.time() - stored_at > self.ttl:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.time(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class DiskStore:
+    # One JSON file per key, shared by every worker on the host. mtime is
+    # bumped on read, so evicting the oldest mtimes is LRU.
+    def __init__(self, path, maxsize, ttl):
+        self.path = path
+        self.maxsize = maxsize
+        self.ttl = ttl
+        os.makedirs(path, exist_ok=True)
+
+    def _file(self, key):
+        return os.path.join(self.path, f'{key}.json')
+
+    def get(self, key):
+        try:
+            with open(self._file(key)) as f:
+                item = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if time.time() - item['stored_at'] > self.ttl:
+            self._remove(self._file(key))
+            return None
+        try:
+            os.utime(self._file(key))
+        except OSError:
+            pass
+        return item['value']
+
+    def set(self, key, value):
+        fd, tmp = tempfile.mkstemp(dir=self.path, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump({'stored_at': time.time(), 'value': value}, f)
+        os.replace(tmp, self._file(key))
+        self._evict()
+
+    def _evict(self):
+        entries = []
+        for name in os.listdir(self.path):
+            if name.endswith('.json'):
+                try:
+                    entries.append((os.path.getmtime(os.path.join(self.path, name)), name))
+                except OSError:
+                    pass
+        if len(entries) <= self.maxsize:
+            return
+        entries.sort()
+        for _, name in entries[:len(entries) - self.maxsize]:
+            self._remove(os.path.join(self.path, name))
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def clear(self):
+        for name in os.listdir(self.path):
+            if name.endswith('.json'):
+                self._remove(os.path.join(self.path, name))
+
+
+class RateLimiter:
+    # Token bucket: `rate` calls per second on average, bursts of `burst`.
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.capacity = burst or max(1, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class CachedLLM:
+    def __init__(self, backend, store=None, limiter=None):
+        self.backend = backend
+        self.store = store
+        self.limiter = limiter
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self._lock = threading.Lock()
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def complete(self, prompt, model, force=False, cache=True, accept=None):
+        # force: skip the lookup but store the fresh reply.
+        # cache=False: neither read nor write (conversational calls).
+        # accept(reply) -> bool: only store replies the caller can use, so a
+        # malformed answer isn't served back for the whole TTL.
+        if self.store is None or not cache:
+            return self._call(prompt, model)
+        key = prompt_key(prompt, model)
+        cached = self._lookup(key, force)
+        if cached is not None:
+            return cached
+        reply = self._call(prompt, model)
+        if accept is None or accept(reply):
+            self._store(key, reply)
+        return reply
+
+    def stream(self, prompt, model, force=False, cache=True):
+        # Yields text chunks as the backend produces them; the joined reply is
+        # stored once the stream completes. A hit comes back as one chunk.
+        use_cache = self.store is not None and cache
+        key = prompt_key(prompt, model) if use_cache else None
+        cached = self._lookup(key, force) if use_cache else None
+        if cached is not None:
+            yield cached
+            return
+        if self.limiter is not None:
+            self.limiter.acquire()
+        parts = []
+        for chunk in self.backend.stream(prompt, model):
+            parts.append(chunk)
+            yield chunk
+        if use_cache:
+            self._store(key, ''.join(parts))
+
+    def _lookup(self, key, force):
+        if force:
+            self._count('bypassed')
+            return None
+        try:
+            cached = self.store.get(key)
+        except Exception as e:
+            # A broken cache must not fail the call; treat it as a miss.
+            print(f"[WARN] LLM cache read failed: {e}", flush=True)
+            cached = None
+        self._count('hits' if cached is not None else 'misses')
+        return cached
+
+    def _store(self, key, reply):
+        try:
+            self.store.set(key, reply)
+        except Exception as e:
+            print(f"[WARN] LLM cache write failed: {e}", flush=True)
+
+    def _call(self, prompt, model):
+        if self.limiter is not None:
+            self.limiter.acquire()
+        return self.backend.complete(prompt, model)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'store': type(self.store).__name__ if self.store else None,
+                'hits': self.hits,
+                'misses': self.misses,
+                'bypassed': self.bypassed,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else None,
+            }
+
+
+def make_store(name, maxsize, ttl, path=None):
+    # 'db' is built by codex_api.py, which owns the table.
+    if name == 'memory':
+        return MemoryStore(maxsize, ttl)
+    if name == 'disk':
+        return DiskStore(path, maxsize, ttl)
+    return None
+
+
+def make_llm(name, api_key=None, delay=0.0):
+    if name == 'fake':
+        return FakeLLMBackend(delay=delay)
+    return OpenAIBackend(api_key)
@@ -0,0 +1,12 @@
+-- Migration: shared LLM completion cache (LLM_CACHE=db)
+-- key is sha256 of model + whitespace-normalized prompt; rows past
+-- LLM_CACHE_TTL are ignored, least recently used rows are evicted beyond
+-- LLM_CACHE_SIZE.
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key VARCHAR(64) PRIMARY KEY,
+    response TEXT NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL,
+    last_used_at TIMESTAMPTZ NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS ix_llm_cache_last_used_at ON llm_cache (last_used_at);
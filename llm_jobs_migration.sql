@@ -0,0 +1,17 @@
+-- Migration: background LLM jobs
+-- Grading, notebook summary, journal match and copilot chat now answer 202
+-- with a row from this table; clients poll GET /jobs/<id> for the result.
+CREATE TABLE IF NOT EXISTS llm_jobs (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    kind VARCHAR(50) NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'queued',
+    result JSON,
+    error TEXT,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    started_at TIMESTAMPTZ,
+    finished_at TIMESTAMPTZ
+);
+
+-- Per-user limit check: active jobs of one user.
+CREATE INDEX IF NOT EXISTS idx_llm_jobs_user_status ON llm_jobs (user_id, status, created_at);
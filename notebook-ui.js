@@ -48,16 +48,48 @@ function getNotebookLocation() {
 getNotebookLocation();
 
 // --- Timeline Fetch/Render ---
-async function fetchNotebookEntries() {
+// The timeline is paged: fetchNotebookEntries() loads the newest page and
+// fetchMoreNotebookEntries() appends the next one when the list is scrolled
+// to the bottom.
+const NOTEBOOK_PAGE_SIZE = 50;
+let notebookNextCursor = null;
+let notebookLoadingMore = false;
+
+async function fetchNotebookPage(cursor) {
   const projectId = getNotebookProjectId();
   const token = localStorage.getItem('access_token');
-  if (!projectId || !token) return [];
-  const res = await fetch(`/projects/${encodeURIComponent(projectId)}/notebook`, { headers: { 'Authorization': 'Bearer ' + token } });
-  if (!res.ok) return [];
-  notebookEntries = await res.json();
+  if (!projectId || !token) return null;
+  let url = `/projects/${encodeURIComponent(projectId)}/notebook?limit=${NOTEBOOK_PAGE_SIZE}`;
+  if (cursor) url += `&cursor=${encodeURIComponent(cursor)}`;
+  const search = document.getElementById('notebook-search').value.trim();
+  if (search) url += `&q=${encodeURIComponent(search)}`;
+  const res = await fetch(url, { headers: { 'Authorization': 'Bearer ' + token } });
+  if (!res.ok) return null;
+  return res.json();
+}
+
+async function fetchNotebookEntries() {
+  const page = await fetchNotebookPage(null);
+  if (!page) return [];
+  notebookEntries = page.items;
+  notebookNextCursor = page.next_cursor;
   return notebookEntries;
 }
 
+async function fetchMoreNotebookEntries() {
+  if (!notebookNextCursor || notebookLoadingMore) return;
+  notebookLoadingMore = true;
+  try {
+    const page = await fetchNotebookPage(notebookNextCursor);
+    if (!page) return;
+    notebookEntries = notebookEntries.concat(page.items);
+    notebookNextCursor = page.next_cursor;
+    renderNotebookTimeline();
+  } finally {
+    notebookLoadingMore = false;
+  }
+}
+
 function groupEntries(entries, groupBy) {
   if (groupBy === 'day') {
     const byDay = {};
@@ -91,12 +123,7 @@ function groupEntries(entries, groupBy) {
 
 function renderNotebookTimeline() {
   const groupBy = document.getElementById('notebook-group-toggle').value;
-  const search = document.getElementById('notebook-search').value.trim().toLowerCase();
-  let entries = notebookEntries;
-  if (search) {
-    entries = entries.filter(e => (e.content || '').toLowerCase().includes(search) || (e.structured || '').toLowerCase().includes(search));
-  }
-  const grouped = groupEntries(entries, groupBy);
+  const grouped = groupEntries(notebookEntries, groupBy);
   const timeline = document.getElementById('notebook-timeline');
   timeline.innerHTML = '';
   Object.keys(grouped).forEach(group => {
@@ -179,13 +206,25 @@ async function loadNotebookEntry(entryId) {
   renderNotebookAttachments(entry.attachments || []);
   // Preview
   updateNotebookPreview();
-  // Diffs
-  if (entry.diffs && entry.diffs.length > 0) {
-    document.getElementById('notebook-diff-view').classList.remove('hidden');
-    document.getElementById('notebook-diff-view').innerHTML = entry.diffs.map(d => `<div class='mb-2'><b>${d.timestamp}</b><pre>${d.diff}</pre></div>`).join('');
-  } else {
-    document.getElementById('notebook-diff-view').classList.add('hidden');
-  }
+  // Diffs (history is fetched only for entries that have been edited)
+  document.getElementById('notebook-diff-view').classList.add('hidden');
+  if (entry.revision > 0) loadNotebookRevisions(entryId);
+}
+
+async function loadNotebookRevisions(entryId) {
+  const token = localStorage.getItem('access_token');
+  const res = await fetch(`/notebook-entries/${encodeURIComponent(entryId)}/revisions?diffs=true`, {
+    headers: { 'Authorization': 'Bearer ' + token }
+  });
+  if (!res.ok || currentEntryId !== entryId) return;
+  const history = await res.json();
+  const diffs = history.legacy_diffs.concat(
+    history.revisions.filter(r => r.diff !== undefined).map(r => ({ timestamp: r.created_at, diff: r.diff }))
+  );
+  if (diffs.length === 0) return;
+  const view = document.getElementById('notebook-diff-view');
+  view.classList.remove('hidden');
+  view.innerHTML = diffs.map(d => `<div class='mb-2'><b>${d.timestamp}</b><pre>${d.diff}</pre></div>`).join('');
 }
 
 function renderNotebookAttachments(attachments) {
@@ -292,7 +331,18 @@ document.getElementById('notebook-method').addEventListener('input', updateNoteb
 document.getElementById('notebook-result').addEventListener('input', updateNotebookPreview);
 document.getElementById('notebook-conc').addEventListener('input', updateNotebookPreview);
 document.getElementById('notebook-group-toggle').addEventListener('change', renderNotebookTimeline);
-document.getElementById('notebook-search').addEventListener('input', renderNotebookTimeline);
+// Search runs on the server (?q=), so it covers entries not loaded yet.
+let notebookSearchTimer = null;
+document.getElementById('notebook-search').addEventListener('input', function() {
+  clearTimeout(notebookSearchTimer);
+  notebookSearchTimer = setTimeout(async () => {
+    await fetchNotebookEntries();
+    renderNotebookTimeline();
+  }, 300);
+});
+document.getElementById('notebook-timeline').addEventListener('scroll', function() {
+  if (this.scrollTop + this.clientHeight >= this.scrollHeight - 100) fetchMoreNotebookEntries();
+});
 
 // --- Attachments ---
 document.getElementById('attach-btn').addEventListener('click', function() {
@@ -305,13 +355,11 @@ document.getElementById('notebook-attach').addEventListener('change', async func
   const projectId = getNotebookProjectId();
   if (!token || !projectId || !currentEntryId) return;
   for (const file of files) {
-    const formData = new FormData();
-    formData.append('file', file);
-    await fetch(`/notebook-entries/${encodeURIComponent(currentEntryId)}/attachments`, {
-      method: 'POST',
-      headers: { 'Authorization': 'Bearer ' + token },
-      body: formData
-    });
+    try {
+      await uploadFile(`/notebook-entries/${encodeURIComponent(currentEntryId)}/uploads`, file);
+    } catch (e) {
+      alert(`Upload of ${file.name} failed: ${e.message}`);
+    }
   }
   await fetchNotebookEntries();
   loadNotebookEntry(currentEntryId);
@@ -332,12 +380,11 @@ document.getElementById('notebook-summary-btn').addEventListener('click', async
   const projectId = getNotebookProjectId();
   if (!token || !projectId) return;
   const style = document.getElementById('notebook-style-toggle').value;
-  const res = await fetch(`/projects/${encodeURIComponent(projectId)}/notebook/summary?style=${encodeURIComponent(style)}`, {
-    headers: { 'Authorization': 'Bearer ' + token }
-  });
-  if (res.ok) {
-    const data = await res.json();
+  try {
+    const data = await runLLMJob(`/projects/${encodeURIComponent(projectId)}/notebook/summary?style=${encodeURIComponent(style)}`);
     alert(data.summary);
+  } catch (e) {
+    alert('AI summary unavailable: ' + e.message);
   }
 });
 
@@ -0,0 +1,17 @@
+-- Migration: notebook edit history as revision rows
+-- PATCH /projects/<id>/notebook no longer appends to notebook_entries.diffs;
+-- it writes a row here (full snapshot every 20th revision, line delta
+-- otherwise). Existing diffs stay where they are and are served as
+-- legacy_diffs by GET /notebook-entries/<id>/revisions.
+ALTER TABLE notebook_entries ADD COLUMN IF NOT EXISTS revision INTEGER NOT NULL DEFAULT 0;
+
+CREATE TABLE IF NOT EXISTS notebook_revisions (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    entry_id UUID NOT NULL REFERENCES notebook_entries(id) ON DELETE CASCADE,
+    revision INTEGER NOT NULL,
+    user_id UUID REFERENCES users(id),
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    content TEXT,
+    delta JSON,
+    CONSTRAINT uq_notebook_revisions_entry_revision UNIQUE (entry_id, revision)
+);
@@ -0,0 +1,13 @@
+-- Migration: cached partial summaries for map-reduce notebook summaries
+-- key = sha256 of the inputs (entry ids + content hashes for a chunk, child
+-- keys for a reduce group) with style and model. Rows for chunks that no
+-- longer exist are deleted after each summary run.
+CREATE TABLE IF NOT EXISTS notebook_summary_chunks (
+    key VARCHAR(64) PRIMARY KEY,
+    project_id UUID NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+    style VARCHAR(50) NOT NULL,
+    summary TEXT NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_notebook_summary_chunks_project ON notebook_summary_chunks (project_id, style);
@@ -0,0 +1,8 @@
+-- Migration: keyset index for the paged notebook timeline
+-- GET /projects/<id>/notebook?limit=N pages by (timestamp, id) newest first;
+-- this index covers both the order and the cursor comparison. It replaces
+-- idx_notebook_entries_project_timestamp from index_pack_migration.sql.
+-- Run with psql -f (CONCURRENTLY cannot run inside a transaction).
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_notebook_entries_project_timestamp_id
+    ON notebook_entries (project_id, timestamp DESC, id DESC);
+DROP INDEX CONCURRENTLY IF EXISTS idx_notebook_entries_project_timestamp;
@@ -79,27 +79,15 @@ document.addEventListener('DOMContentLoaded', function() {
   document.getElementById('journal-match-btn').onclick = async function() {
     const paperContent = aceEditor.getValue();
     const experimentContext = getFullExperimentContext();
-    let res, data;
+    let data;
     try {
-      res = await fetch('/journal-match', {
+      data = await runLLMJob('/journal-match', {
         method: 'POST',
-        headers: { 'Content-Type': 'application/json', 'Authorization': 'Bearer ' + (localStorage.getItem('access_token')||'') },
+        headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify({ content: paperContent, experiment_context: experimentContext })
       });
-      data = await res.json();
-      if (!res.ok || !data.journals) throw new Error('No journals');
     } catch (e) {
-      // Fallback: try old API format (just paper content)
-      try {
-        res = await fetch('/journal-match', {
-          method: 'POST',
-          headers: { 'Content-Type': 'application/json', 'Authorization': 'Bearer ' + (localStorage.getItem('access_token')||'') },
-          body: JSON.stringify({ content: paperContent })
-        });
-        data = await res.json();
-      } catch (err) {
-        data = { journals: [] };
-      }
+      data = { journals: [] };
     }
     renderJournalMatches(data.journals||[]);
   };
@@ -211,13 +199,21 @@ function createCopilotModal() {
     appendCopilotMessage('user', msg);
     input.value = '';
     const experimentContext = getFullExperimentContext();
-    const res = await fetch('/copilot-chat', {
-      method: 'POST',
-      headers: { 'Content-Type': 'application/json', 'Authorization': 'Bearer ' + (localStorage.getItem('access_token')||'') },
-      body: JSON.stringify({ message: msg, experiment_context: experimentContext })
-    });
-    const data = await res.json();
-    appendCopilotMessage('copilot', data.reply||'[No response]');
+    const bubble = appendCopilotMessage('copilot', '');
+    const win = document.getElementById('copilot-chat-window');
+    try {
+      const data = await streamLLM('/copilot-chat', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ message: msg, experiment_context: experimentContext })
+      }, text => {
+        bubble.textContent += text;
+        win.scrollTop = win.scrollHeight;
+      });
+      bubble.textContent = data.reply || '[No response]';
+    } catch (e) {
+      bubble.textContent = `[Copilot unavailable: ${e.message}]`;
+    }
   };
 }
 
@@ -228,6 +224,7 @@ function appendCopilotMessage(sender, text) {
   div.innerHTML = `<span class='inline-block px-3 py-2 rounded ${sender==='user'?'bg-cyan-800 text-cyan-100':'bg-cyan-900 text-cyan-200'}'>${text}</span>`;
   win.appendChild(div);
   win.scrollTop = win.scrollHeight;
+  return div.querySelector('span');
 }
 
 // --- Helper: Get full experiment context for prompts ---
@@ -0,0 +1,21 @@
+-- Migration: explicit Project -> Experiment link
+-- Replaces the title + owner_id matching used to find a project's experiment.
+ALTER TABLE projects ADD COLUMN IF NOT EXISTS experiment_id UUID REFERENCES experiments(id) ON DELETE SET NULL;
+
+-- Backfill: projects created through POST /projects or a fork share their id with the experiment
+UPDATE projects p SET experiment_id = e.id
+FROM experiments e
+WHERE p.experiment_id IS NULL AND e.id = p.id;
+
+-- Everything else: the oldest experiment with the same title and owner
+UPDATE projects p SET experiment_id = m.experiment_id
+FROM (
+    SELECT DISTINCT ON (p2.id) p2.id AS project_id, e.id AS experiment_id
+    FROM projects p2
+    JOIN experiments e ON e.title = p2.title AND e.owner_id = p2.owner_id
+    WHERE p2.experiment_id IS NULL
+    ORDER BY p2.id, e.created_at, e.id
+) m
+WHERE p.id = m.project_id;
+
+CREATE INDEX IF NOT EXISTS idx_projects_experiment_id ON projects (experiment_id);
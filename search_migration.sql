@@ -0,0 +1,46 @@
+-- Migration: full-text search columns for GET /search
+-- Each searchable table gets a generated tsvector column, which Postgres
+-- recomputes on every INSERT/UPDATE, and a GIN index on it. The expressions
+-- must stay in step with SEARCH_SOURCES in codex_api.py (titles weigh more
+-- than bodies). Requires Postgres 12+ (generated columns) and 11+ for
+-- websearch_to_tsquery.
+-- ADD COLUMN ... STORED rewrites each table once; run off-peak on large
+-- installs. The indexes are built CONCURRENTLY, so run with psql -f (each
+-- statement autocommits; CONCURRENTLY cannot run inside a transaction).
+
+ALTER TABLE notebook_entries ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (to_tsvector('english'::regconfig, coalesce(content, ''))) STORED;
+
+ALTER TABLE experiment_steps ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english'::regconfig, coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english'::regconfig, coalesce(content_markdown, '')), 'B') ||
+        setweight(to_tsvector('english'::regconfig, coalesce(results_markdown, '')), 'B')
+    ) STORED;
+
+ALTER TABLE chat_messages ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (to_tsvector('english'::regconfig, coalesce(content, ''))) STORED;
+
+ALTER TABLE projects ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english'::regconfig, coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english'::regconfig, coalesce(paper_content, '')), 'B')
+    ) STORED;
+
+ALTER TABLE discovery_items ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english'::regconfig, coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english'::regconfig, coalesce(description, '')), 'B') ||
+        setweight(to_tsvector('english'::regconfig, coalesce(field, '') || ' ' || coalesce(lead_name, '')), 'C')
+    ) STORED;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_notebook_entries_search
+    ON notebook_entries USING GIN (search_vector);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_experiment_steps_search
+    ON experiment_steps USING GIN (search_vector);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_chat_messages_search
+    ON chat_messages USING GIN (search_vector);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_projects_search
+    ON projects USING GIN (search_vector);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_discovery_items_search
+    ON discovery_items USING GIN (search_vector);
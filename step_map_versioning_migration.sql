@@ -0,0 +1,5 @@
+-- Migration: step_map as JSONB with an optimistic-concurrency version counter
+-- PATCH /protocol-versions/<id>/step-map accepts RFC 6902 patches and only
+-- writes when step_map_version still matches what the client last saw.
+ALTER TABLE protocol_versions ALTER COLUMN step_map TYPE JSONB USING step_map::jsonb;
+ALTER TABLE protocol_versions ADD COLUMN IF NOT EXISTS step_map_version INTEGER NOT NULL DEFAULT 0;
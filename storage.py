@@ -0,0 +1,213 @@
+# Where attachment bytes live. codex_api.py addresses files by key (blobs are
+# blobs/<aa>/<bb>/<sha256>); uploads arriving through the app are staged on
+# local disk first and handed to put() once their hash is known.
+#   - LocalStorage: a directory (UPLOAD_FOLDER). put() is a rename and the
+#     app serves downloads itself (or the proxy does, see ATTACHMENT_OFFLOAD).
+#   - S3Storage: a bucket on S3 or any S3-compatible store (MinIO, moto's
+#     server; set endpoint_url). Large files go up as multipart uploads,
+#     downloads redirect to a presigned GET, and clients can PUT straight to
+#     the bucket with a presigned URL.
+import base64
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+from contextlib import contextmanager
+from urllib.parse import quote
+
+# Largest object S3 accepts in a single PUT.
+MAX_SINGLE_PUT = 5 * 1024 ** 3
+CHUNK_SIZE = 1024 * 1024
+
+
+def content_disposition(filename):
+    ascii_name = filename.encode('ascii', 'ignore').decode().replace('"', '').replace('\\', '') or 'download'
+    return f"attachment; filename=\"{ascii_name}\"; filename*=UTF-8''{quote(filename)}"
+
+
+class LocalStorage:
+    direct_uploads = False
+
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def local_path(self, key):
+        return os.path.join(self.root, key)
+
+    def size(self, key):
+        # None if there is no such file.
+        try:
+            return os.path.getsize(self.local_path(key))
+        except OSError:
+            return None
+
+    def exists(self, key):
+        return os.path.isfile(self.local_path(key))
+
+    def sha256(self, key):
+        h = hashlib.sha256()
+        with open(self.local_path(key), 'rb') as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+                h.update(chunk)
+        return h.hexdigest()
+
+    def put(self, path, key, keep=False):
+        # Moves the local file at `path` to `key` (copies it with keep).
+        final = self.local_path(key)
+        os.makedirs(os.path.dirname(final), exist_ok=True)
+        if keep:
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(final))
+            os.close(fd)
+            shutil.copyfile(path, tmp)
+            path = tmp
+        os.replace(path, final)
+
+    def copy(self, key, new_key):
+        self.put(self.local_path(key), new_key, keep=True)
+
+    def move(self, key, new_key):
+        self.put(self.local_path(key), new_key)
+
+    def delete(self, key):
+        try:
+            os.remove(self.local_path(key))
+        except OSError:
+            pass
+
+    @contextmanager
+    def fetch(self, key):
+        # A local path to read the file from while the block runs.
+        yield self.local_path(key)
+
+    def download_url(self, key, filename, mimetype=None, expires=3600):
+        # None: the app sends the file.
+        return None
+
+    def upload_url(self, key, content_hash, mimetype=None, expires=3600):
+        return None
+
+
+class S3Storage:
+    direct_uploads = True
+
+    def __init__(self, bucket, endpoint_url=None, region=None, pool_size=10, part_size=8 * 1024 * 1024):
+        self.bucket = bucket
+        self.endpoint_url = endpoint_url
+        self.region = region
+        self.pool_size = pool_size
+        self.part_size = part_size
+        self._client = None
+        self._transfer = None
+        self._lock = threading.Lock()
+
+    def client(self):
+        # Created on first use and shared by every thread; its connection
+        # pool keeps up to pool_size connections to the store open.
+        with self._lock:
+            if self._client is None:
+                import boto3
+                from boto3.s3.transfer import TransferConfig
+                from botocore.config import Config
+                config = Config(
+                    max_pool_connections=self.pool_size,
+                    signature_version='s3v4',
+                    # MinIO and moto serve buckets under the path, not as subdomains.
+                    s3={'addressing_style': 'path' if self.endpoint_url else 'auto'},
+                )
+                self._client = boto3.session.Session().client(
+                    's3', endpoint_url=self.endpoint_url, region_name=self.region, config=config
+                )
+                self._transfer = TransferConfig(
+                    multipart_threshold=self.part_size,
+                    multipart_chunksize=self.part_size,
+                    max_concurrency=min(self.pool_size, 10),
+                )
+            return self._client
+
+    def transfer_config(self):
+        self.client()
+        return self._transfer
+
+    def local_path(self, key):
+        return None
+
+    def size(self, key):
+        from botocore.exceptions import ClientError
+        try:
+            return self.client().head_object(Bucket=self.bucket, Key=key)['ContentLength']
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') in ('404', 'NoSuchKey', 'NotFound'):
+                return None
+            raise
+
+    def exists(self, key):
+        return self.size(key) is not None
+
+    def sha256(self, key):
+        # S3 keeps the sha256 it verified on a checksummed PUT, so this is
+        # usually one HEAD; stores that don't are read back and hashed.
+        head = self.client().head_object(Bucket=self.bucket, Key=key, ChecksumMode='ENABLED')
+        checksum = head.get('ChecksumSHA256')
+        if checksum and '-' not in checksum:
+            return base64.b64decode(checksum).hex()
+        h = hashlib.sha256()
+        body = self.client().get_object(Bucket=self.bucket, Key=key)['Body']
+        for chunk in body.iter_chunks(CHUNK_SIZE):
+            h.update(chunk)
+        return h.hexdigest()
+
+    def put(self, path, key, keep=False):
+        # Multipart above part_size, parts sent in parallel; the local file
+        # is removed once the object is complete, unless keep.
+        self.client().upload_file(path, self.bucket, key, Config=self.transfer_config())
+        if not keep:
+            os.remove(path)
+
+    def copy(self, key, new_key):
+        # Server-side copy (multipart for large objects); no bytes pass
+        # through this process.
+        self.client().copy({'Bucket': self.bucket, 'Key': key}, self.bucket, new_key, Config=self.transfer_config())
+
+    def move(self, key, new_key):
+        self.copy(key, new_key)
+        self.delete(key)
+
+    def delete(self, key):
+        self.client().delete_object(Bucket=self.bucket, Key=key)
+
+    @contextmanager
+    def fetch(self, key):
+        fd, path = tempfile.mkstemp(prefix='codex-')
+        os.close(fd)
+        try:
+            self.client().download_file(self.bucket, key, path, Config=self.transfer_config())
+            yield path
+        finally:
+            os.remove(path)
+
+    def download_url(self, key, filename, mimetype=None, expires=3600):
+        params = {'Bucket': self.bucket, 'Key': key, 'ResponseContentDisposition': content_disposition(filename)}
+        if mimetype:
+            params['ResponseContentType'] = mimetype
+        return self.client().generate_presigned_url('get_object', Params=params, ExpiresIn=expires)
+
+    def upload_url(self, key, content_hash, mimetype=None, expires=3600):
+        # (url, headers the PUT must carry). The store checks the body
+        # against the sha256 in the signed checksum header and rejects
+        # anything else, so the key can be trusted to hold content_hash.
+        checksum = base64.b64encode(bytes.fromhex(content_hash)).decode()
+        params = {'Bucket': self.bucket, 'Key': key, 'ChecksumSHA256': checksum}
+        headers = {'x-amz-checksum-sha256': checksum}
+        if mimetype:
+            params['ContentType'] = mimetype
+            headers['Content-Type'] = mimetype
+        url = self.client().generate_presigned_url('put_object', Params=params, ExpiresIn=expires)
+        return url, headers
+
+
+def make_storage(name, root, bucket=None, endpoint_url=None, region=None, pool_size=10, part_size=8 * 1024 * 1024):
+    if name == 's3':
+        return S3Storage(bucket, endpoint_url, region, pool_size, part_size)
+    return LocalStorage(root)
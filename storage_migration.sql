@@ -0,0 +1,10 @@
+-- Migration: pluggable attachment storage (STORAGE_BACKEND=local|s3)
+-- Direct uploads (POST /steps/<id>/files/upload-url,
+-- POST /notebook-entries/<id>/files/upload-url) declare the file's sha256 up
+-- front; the bucket checks the PUT against it and complete trusts the stored
+-- value. Chunked uploads may declare it too and have it checked on complete.
+-- Before switching an existing install to s3, copy uploads/blobs/ to the
+-- bucket's blobs/ prefix (e.g. `aws s3 sync uploads/blobs s3://$S3_BUCKET/blobs`)
+-- and run `python dedupe_uploads.py` with STORAGE_BACKEND=s3 to upload any
+-- files still at legacy paths.
+ALTER TABLE upload_sessions ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64);
@@ -0,0 +1,22 @@
+-- Migration: chunked, resumable attachment uploads
+-- One row per upload in progress (POST /steps/<id>/uploads,
+-- POST /notebook-entries/<id>/uploads). The row is deleted when the upload
+-- completes; expired rows and their partial files are removed by
+-- `flask --app codex_api purge-uploads` (and opportunistically whenever an
+-- upload starts).
+CREATE TABLE IF NOT EXISTS upload_sessions (
+    id UUID PRIMARY KEY,
+    user_id UUID NOT NULL REFERENCES users(id),
+    target VARCHAR(20) NOT NULL,
+    target_id UUID NOT NULL,
+    filename VARCHAR(255) NOT NULL,
+    mime_type VARCHAR(100),
+    size_bytes BIGINT NOT NULL,
+    part_size INTEGER NOT NULL,
+    storage_path TEXT NOT NULL,
+    parts JSON,
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    expires_at TIMESTAMPTZ NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_upload_sessions_expires ON upload_sessions (expires_at);
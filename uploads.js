@@ -0,0 +1,67 @@
+// Chunked, resumable attachment uploads. uploadFile(initUrl, file) starts a
+// session at initUrl (/steps/<id>/uploads or /notebook-entries/<id>/uploads),
+// PUTs the file part by part and completes it, resolving with the new
+// attachment. Failed parts are retried; the session id is remembered in
+// localStorage so re-selecting the same file after a reload or a dropped
+// connection only sends the parts the server doesn't have yet.
+const UPLOAD_PART_RETRIES = 3;
+
+function uploadResumeKey(initUrl, file) {
+  return `upload:${initUrl}:${file.name}:${file.size}:${file.lastModified}`;
+}
+
+async function uploadRequest(url, options = {}) {
+  const token = localStorage.getItem('access_token') || '';
+  const headers = Object.assign({ 'Authorization': 'Bearer ' + token }, options.headers || {});
+  const res = await fetch(url, Object.assign({}, options, { headers }));
+  const body = res.status === 204 ? {} : await res.json().catch(() => ({}));
+  if (!res.ok) {
+    const err = new Error(body.error || body.description || res.status);
+    err.status = res.status;
+    throw err;
+  }
+  return body;
+}
+
+async function resumeOrStartUpload(initUrl, file) {
+  const key = uploadResumeKey(initUrl, file);
+  const saved = localStorage.getItem(key);
+  if (saved) {
+    try {
+      return await uploadRequest(`/uploads/${encodeURIComponent(saved)}`);
+    } catch (e) {
+      localStorage.removeItem(key);  // expired or already completed
+    }
+  }
+  const upload = await uploadRequest(initUrl, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify({ filename: file.name, size: file.size, mime_type: file.type || null })
+  });
+  localStorage.setItem(key, upload.id);
+  return upload;
+}
+
+async function uploadFile(initUrl, file, onProgress = () => {}) {
+  const upload = await resumeOrStartUpload(initUrl, file);
+  const received = new Set(upload.received);
+  let done = received.size;
+  onProgress(done / upload.part_count);
+  for (let n = 0; n < upload.part_count; n++) {
+    if (received.has(n)) continue;
+    const part = file.slice(n * upload.part_size, (n + 1) * upload.part_size);
+    for (let attempt = 1; ; attempt++) {
+      try {
+        await uploadRequest(`/uploads/${encodeURIComponent(upload.id)}/parts/${n}`, { method: 'PUT', body: part });
+        break;
+      } catch (e) {
+        if (attempt >= UPLOAD_PART_RETRIES || (e.status && e.status < 500)) throw e;
+        await new Promise(resolve => setTimeout(resolve, 1000 * 2 ** attempt));
+      }
+    }
+    onProgress(++done / upload.part_count);
+  }
+  const attachment = await uploadRequest(`/uploads/${encodeURIComponent(upload.id)}/complete`, { method: 'POST' });
+  localStorage.removeItem(uploadResumeKey(initUrl, file));
+  return attachment;
+}